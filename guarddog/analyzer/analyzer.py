@@ -1,21 +1,33 @@
+import functools
 import json
 import logging
 import os
 import subprocess
 import yara  # type: ignore
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Iterable, Optional, Dict
 
 from guarddog.analyzer.metadata import get_metadata_detectors
 from guarddog.analyzer.sourcecode import get_sourcecode_rules, SempgrepRule, YaraRule
 from guarddog.ecosystems import ECOSYSTEM
+from guarddog.utils.config import METADATA_CACHE, SEMGREP_JOBS
 
 SEMGREP_MAX_TARGET_BYTES = 10_000_000
 
 log = logging.getLogger("guarddog")
 
 
+@functools.lru_cache(maxsize=None)
+def get_sourcecode_rule_ids(ecosystem: ECOSYSTEM, kind: type) -> frozenset[str]:
+    """
+    Returns the identifiers of the source code rules of a given kind for an ecosystem,
+    computed once and shared by all Analyzer instances
+    """
+    return frozenset(r.id for r in get_sourcecode_rules(ecosystem, kind))
+
+
 class Analyzer:
     """
     Analyzes a local directory for threats found by source code or metadata rules
@@ -23,13 +35,14 @@ class Analyzer:
     Attributes:
         sourcecode_rules_path (str): path to source code rules
         ecosystem (str): name of the current ecosystem
-        metadata_ruleset (list): list of metadata rule names
-        sourcecode_ruleset (list): list of source code rule names
-        ioc_ruleset (list): list of ioc rule names
+        metadata_ruleset (frozenset): set of metadata rule names
+        semgrep_ruleset (frozenset): set of semgrep source code rule names
+        yara_ruleset (frozenset): set of yara source code rule names
 
         exclude (list): list of directories to exclude from source code search
 
         metadata_detectors(list): list of metadata detectors
+        metadata_cache (dict): results of metadata rules per rule, package name and version
     """
 
     def __init__(self, ecosystem=ECOSYSTEM.PYPI) -> None:
@@ -39,13 +52,10 @@ class Analyzer:
         # Rules and associated detectors
         self.metadata_detectors = get_metadata_detectors(ecosystem)
 
-        self.metadata_ruleset: set[str] = set(self.metadata_detectors.keys())
-        self.semgrep_ruleset: set[str] = set(
-            r.id for r in get_sourcecode_rules(ecosystem, SempgrepRule)
-        )
-        self.yara_ruleset: set[str] = set(
-            r.id for r in get_sourcecode_rules(ecosystem, YaraRule)
-        )
+        self.metadata_ruleset: frozenset[str] = frozenset(self.metadata_detectors.keys())
+        self.metadata_cache: dict[tuple[str, str, str], tuple[bool, Optional[str]]] = {}
+        self.semgrep_ruleset: frozenset[str] = get_sourcecode_rule_ids(ecosystem, SempgrepRule)
+        self.yara_ruleset: frozenset[str] = get_sourcecode_rule_ids(ecosystem, YaraRule)
 
         # Define paths to exclude from sourcecode analysis
         self.exclude = [
@@ -122,8 +132,15 @@ class Analyzer:
 
         for rule in all_rules:
             try:
-                log.debug(f"Running rule {rule} against package '{name}'")
-                rule_matches, message = self.metadata_detectors[rule].detect(info, path, name, version)
+                cache_key = (rule, name, version) if METADATA_CACHE and name and version else None
+                if cache_key in self.metadata_cache:
+                    log.debug(f"Using cached result of rule {rule} for package '{name}'")
+                    rule_matches, message = self.metadata_cache[cache_key]  # type: ignore
+                else:
+                    log.debug(f"Running rule {rule} against package '{name}'")
+                    rule_matches, message = self.metadata_detectors[rule].detect(info, path, name, version)
+                    if cache_key is not None:
+                        self.metadata_cache[cache_key] = (rule_matches, message)
                 results[rule] = None
                 if rule_matches:
                     issues += 1
@@ -144,9 +161,12 @@ class Analyzer:
         Returns:
             dict[str]: map from each source code rule and their corresponding output
         """
-        semgrepscan_results = self.analyze_semgrep(path, rules)
-
-        yarascan_results = self.analyze_yara(path, rules)
+        # semgrep runs out of process, so yara rules can be matched while it is scanning
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            semgrepscan_future = pool.submit(self.analyze_semgrep, path, rules)
+            yarascan_future = pool.submit(self.analyze_yara, path, rules)
+            semgrepscan_results = semgrepscan_future.result()
+            yarascan_results = yarascan_future.result()
 
         # Concatenate dictionaries together
         issues = semgrepscan_results["issues"] + yarascan_results["issues"]
@@ -230,9 +250,11 @@ class Analyzer:
         errors = {}
         issues = 0
 
-        rules_path = list(map(
-            lambda rule_name: os.path.join(self.sourcecode_rules_path, f"{rule_name}.yml"),
-            all_rules
+        # all selected rules run in a single semgrep process, each rule file is passed only once
+        rules_path = sorted(set(
+            os.path.join(self.sourcecode_rules_path, rule.file)
+            for rule in get_sourcecode_rules(self.ecosystem, SempgrepRule)
+            if rule.id in all_rules
         ))
 
         if len(rules_path) == 0:
@@ -243,6 +265,8 @@ class Analyzer:
             log.debug(f"Running semgrep code rules against {path}")
             response = self._invoke_semgrep(target=path, rules=rules_path)
             rule_results = self._format_semgrep_response(response, targetpath=targetpath)
+            # a rule file may define rules that were not requested
+            rule_results = {rule: findings for rule, findings in rule_results.items() if rule in all_rules}
             issues += sum(len(res) for res in rule_results.values())
 
             results = results | rule_results
@@ -262,6 +286,7 @@ class Analyzer:
             cmd.append("--no-git-ignore")
             cmd.append("--json")
             cmd.append("--quiet")
+            cmd.append(f"--jobs={SEMGREP_JOBS}")
             cmd.append(f"--max-target-bytes={SEMGREP_MAX_TARGET_BYTES}")
             cmd.append(target)
             log.debug(f"Invoking semgrep with command line: {' '.join(cmd)}")
@@ -309,14 +334,21 @@ output: {e.output}
 
         results = defaultdict(list)
 
+        # resolved once, os.path.abspath and os.path.relpath would query the working directory for every finding
+        cwd = os.getcwd()
+        target_prefix = os.path.join(os.path.abspath(targetpath), "") if targetpath else None
+
         for result in response["results"]:
             rule_name = rule or result["check_id"].split(".")[-1]
             code_snippet = result["extra"]["lines"]
             line = result["start"]["line"]
 
-            file_path = os.path.abspath(result["path"])
-            if targetpath:
-                file_path = os.path.relpath(file_path, targetpath)
+            file_path = os.path.normpath(os.path.join(cwd, result["path"]))
+            if target_prefix:
+                if file_path.startswith(target_prefix):
+                    file_path = file_path[len(target_prefix):]
+                else:
+                    file_path = os.path.relpath(file_path, target_prefix)
 
             location = file_path + ":" + str(line)
             code = self.trim_code_snippet(code_snippet)
@@ -16,4 +16,5 @@ class PypiEmptyInfoDetector(EmptyInfoDetector):
     def detect(self, package_info, path: Optional[str] = None, name: Optional[str] = None,
                version: Optional[str] = None) -> tuple[bool, str]:
         log.debug(f"Running PyPI empty description heuristic on package {name} version {version}")
-        return len(package_info["info"]["description"].strip()) == 0, EmptyInfoDetector.MESSAGE_TEMPLATE % "PyPI"
+        description = package_info["info"].get("description") or ""
+        return not description.strip(), EmptyInfoDetector.MESSAGE_TEMPLATE % "PyPI"
@@ -60,9 +60,16 @@ def get_sourcecode_rules(
 
 SOURCECODE_RULES: list[SourceCodeRule] = list()
 
-semgrep_rule_file_names = list(
-    filter(lambda x: x.endswith("yml"), os.listdir(current_dir))
-)
+# a single scan of the rules directory provides both the semgrep and the YARA rule files
+semgrep_rule_file_names: list[str] = []
+yara_rule_file_names: list[str] = []
+with os.scandir(current_dir) as entries:
+    for entry in entries:
+        if entry.name.endswith("yml"):
+            semgrep_rule_file_names.append(entry.name)
+        elif entry.name.endswith("yar"):
+            yara_rule_file_names.append(entry.name)
+
 # all yml files placed in the sourcecode directory are loaded as semgrep rules
 # refer to README.md for more information
 for file_name in semgrep_rule_file_names:
@@ -99,9 +106,6 @@ for file_name in semgrep_rule_file_names:
                         )
                     )
 
-yara_rule_file_names = list(
-    filter(lambda x: x.endswith("yar"), os.listdir(current_dir))
-)
 # all yar files placed in the sourcecode directory are loaded as YARA rules
 # refer to README.md for more information
 for file_name in yara_rule_file_names:
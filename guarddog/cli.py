@@ -4,16 +4,16 @@ CLI command that scans a package version for user-specified malware flags.
 Includes rules based on package registry metadata and source code analysis.
 """
 
-from functools import reduce
+import functools
 import json as js
 import logging
 import os
 import sys
-from typing import Optional, cast
+from typing import Callable, Iterable, Optional, Sequence, cast
 
 import click
 from prettytable import PrettyTable
-from termcolor import colored
+import termcolor
 
 from guarddog.analyzer.metadata import get_metadata_detectors
 from guarddog.analyzer.sourcecode import get_sourcecode_rules
@@ -23,6 +23,7 @@ from guarddog.scanners import get_scanner
 from guarddog.scanners.scanner import PackageScanner
 
 EXIT_CODE_ISSUES_FOUND = 1
+EXIT_CODE_SCAN_FAILED = 2
 
 AVAILABLE_LOG_LEVELS = {logging.DEBUG, logging.INFO, logging.WARN, logging.ERROR}
 AVAILABLE_LOG_LEVELS_NAMES = list(
@@ -32,6 +33,31 @@ AVAILABLE_LOG_LEVELS_NAMES = list(
 log = logging.getLogger("guarddog")
 
 
+def _no_color(text: str, *args, **kwargs) -> str:
+    return text
+
+
+# Decided once, so that output which is not going to a terminal skips building ANSI escapes for every finding
+colored = termcolor.colored if sys.stdout.isatty() or "FORCE_COLOR" in os.environ else _no_color
+
+
+class LazyChoice(click.Choice):
+    """
+    Choice parameter type whose choices are only computed once click needs them,
+    so that building the command tree does not walk the rule registries
+    """
+    def __init__(self, get_choices: Callable[[], Iterable[str]], case_sensitive: bool = True) -> None:
+        self._get_choices = get_choices
+        self._choices: Optional[Sequence[str]] = None
+        self.case_sensitive = case_sensitive
+
+    @property  # type: ignore[override]
+    def choices(self) -> Sequence[str]:
+        if self._choices is None:
+            self._choices = sorted(self._get_choices())
+        return self._choices
+
+
 def common_options(fn):
     fn = click.option(
         "--exit-non-zero-on-finding",
@@ -44,26 +70,17 @@ def common_options(fn):
 
 
 def legacy_rules_options(fn):
-    ALL_RULES = reduce(
-        lambda a, b: a | b,
-        map(
-            lambda e: set(r.id for r in get_sourcecode_rules(e))
-            | set(get_metadata_detectors(e).keys()),
-            [e for e in ECOSYSTEM],
-        ),
-    )
-
     fn = click.option(
         "-r",
         "--rules",
         multiple=True,
-        type=click.Choice(ALL_RULES, case_sensitive=False),
+        type=LazyChoice(_get_all_ecosystems_rules, case_sensitive=False),
     )(fn)
     fn = click.option(
         "-x",
         "--exclude-rules",
         multiple=True,
-        type=click.Choice(ALL_RULES, case_sensitive=False),
+        type=LazyChoice(_get_all_ecosystems_rules, case_sensitive=False),
     )(fn)
     return fn
 
@@ -118,12 +135,24 @@ def cli(log_level):
     logger.addHandler(stdoutHandler)
 
 
-def _get_all_rules(ecosystem: ECOSYSTEM) -> set[str]:
-    return set(r.id for r in get_sourcecode_rules(ecosystem)) | set(
+@functools.cache
+def _get_all_rules(ecosystem: ECOSYSTEM) -> frozenset[str]:
+    return frozenset(r.id for r in get_sourcecode_rules(ecosystem)) | frozenset(
         get_metadata_detectors(ecosystem).keys()
     )
 
 
+@functools.cache
+def _get_sorted_rules(ecosystem: ECOSYSTEM) -> tuple[str, ...]:
+    # stable ordering keeps the rules of SARIF reports deterministic
+    return tuple(sorted(_get_all_rules(ecosystem)))
+
+
+@functools.cache
+def _get_all_ecosystems_rules() -> frozenset[str]:
+    return frozenset().union(*(_get_all_rules(e) for e in ECOSYSTEM))
+
+
 def _get_rule_param(
     rules: tuple[str, ...], exclude_rules: tuple[str, ...], ecosystem: ECOSYSTEM
 ) -> Optional[set]:
@@ -137,7 +166,7 @@ def _get_rule_param(
 
     if len(exclude_rules) > 0:
         all_rules = _get_all_rules(ecosystem)
-        rule_param = all_rules - set(exclude_rules)
+        rule_param = set(all_rules) - set(exclude_rules)
 
         if len(rules) > 0:
             print("--rules and --exclude-rules cannot be used together")
@@ -167,8 +196,13 @@ def _verify(
             if result["version"] is None
             else f"{result['dependency']} version {result['version']}"
         )
+        scan_errors = result["result"].get("errors", {})
         if output_format is None:
-            print_scan_results(result.get("result"), identifier)
+            if "scan" in scan_errors:
+                # the dependency could not be scanned, no indicators count must be reported for it
+                print_errors(scan_errors, identifier)
+            else:
+                print_scan_results(result.get("result"), identifier)
 
         if len(result.get("errors", [])) > 0:
             print_errors(result.get("error"), identifier)
@@ -178,8 +212,7 @@ def _verify(
         return_value = js.dumps(results)
 
     if output_format == "sarif":
-        sarif_rules = _get_all_rules(ecosystem)
-        return_value = report_verify_sarif(path, list(sarif_rules), results, ecosystem)
+        return_value = report_verify_sarif(path, _get_sorted_rules(ecosystem), results, ecosystem)
 
     if output_format is not None:
         print(return_value)
@@ -187,6 +220,9 @@ def _verify(
     if exit_non_zero_on_finding:
         exit_with_status_code([result["result"] for result in results])
 
+    # a dependency that failed to scan (e.g. removed from the registry) must not pass silently
+    exit_on_scan_failure([result["result"] for result in results])
+
     return return_value  # this is mostly for testing
 
 
@@ -278,18 +314,20 @@ class CliEcosystem(click.Group):
         self.ecosystem = ecosystem
 
         def rule_options(fn):
-            rules = _get_all_rules(self.ecosystem)
+            def rules():
+                return _get_all_rules(self.ecosystem)
+
             fn = click.option(
                 "-r",
                 "--rules",
                 multiple=True,
-                type=click.Choice(rules, case_sensitive=False),
+                type=LazyChoice(rules, case_sensitive=False),
             )(fn)
             fn = click.option(
                 "-x",
                 "--exclude-rules",
                 multiple=True,
-                type=click.Choice(rules, case_sensitive=False),
+                type=LazyChoice(rules, case_sensitive=False),
             )(fn)
             return fn
 
@@ -452,3 +490,10 @@ def exit_with_status_code(results):
         num_issues = result.get("issues", 0)
         if num_issues > 0:
             exit(EXIT_CODE_ISSUES_FOUND)
+
+
+# Exit with an error status code if any dependency could not be scanned
+def exit_on_scan_failure(results):
+    for result in results:
+        if "scan" in result.get("errors", {}):
+            exit(EXIT_CODE_SCAN_FAILED)
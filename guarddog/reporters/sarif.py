@@ -1,5 +1,6 @@
 import hashlib
 import json
+from typing import Iterable
 
 from guarddog.analyzer.sourcecode import get_sourcecode_rules
 from guarddog.analyzer.metadata import get_metadata_detectors
@@ -138,7 +139,7 @@ def get_region(package_raw: str, package: str) -> dict:
 
 def report_verify_sarif(
     package_path: str,
-    rule_names: list[str],
+    rule_names: Iterable[str],
     scan_results: list[dict],
     ecosystem: ECOSYSTEM,
 ) -> str:
@@ -61,7 +61,7 @@ class NPMRequirementsScanner(ProjectScanner):
 
             # If just the best matched version scan is required we only keep one
             if not VERIFY_EXHAUSTIVE_DEPENDENCIES and result:
-                result = [sorted(result).pop()]
+                result = [max(result)]
 
             return set([str(r) for r in result])
 
@@ -91,10 +91,16 @@ class NPMRequirementsScanner(ProjectScanner):
 
         results = {}
         for package, all_selectors in merged.items():
+            try:
+                available_versions = find_all_versions(package)
+            except Exception as e:
+                log.error(f"Unable to retrieve versions of {package}: {str(e)}")
+                continue
+
             versions = set()  # type: set[str]
             for selector in all_selectors:
                 versions = versions.union(
-                    get_matched_versions(find_all_versions(package), selector)
+                    get_matched_versions(available_versions, selector)
                 )
             if len(versions) == 0:
                 log.error(f"Package/Version {package} not on NPM\n")
@@ -1,16 +1,82 @@
+import concurrent.futures
+import functools
 import logging
 import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 import pkg_resources
 import requests
-from packaging.specifiers import Specifier, Version
+from packaging.specifiers import SpecifierSet
+from packaging.version import Version
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 
 from guarddog.scanners.pypi_package_scanner import PypiPackageScanner
 from guarddog.scanners.scanner import ProjectScanner
-from guarddog.utils.config import VERIFY_EXHAUSTIVE_DEPENDENCIES
+from guarddog.utils.config import PARALLELISM, VERIFY_EXHAUSTIVE_DEPENDENCIES
 
 log = logging.getLogger("guarddog")
 
+# PEP 691 JSON flavour of the simple index, much lighter than the full JSON API payload
+PYPI_SIMPLE_INDEX_CONTENT_TYPE = "application/vnd.pypi.simple.v1+json"
+PYPI_REQUEST_TIMEOUT = 10
+
+# keep-alive connections to PyPI are shared by every lookup, transient failures are retried
+SESSION = requests.Session()
+SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=PARALLELISM,
+        pool_maxsize=PARALLELISM,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.2,
+            status_forcelist=[429, 500, 502, 503, 504],
+            raise_on_status=False,
+        ),
+    ),
+)
+
+# requirement lines start with a word character, anything else is an option or a comment
+REQUIREMENT_LINE_PATTERN = re.compile(r"\w")
+BACKSLASH_REMOVAL_TABLE = str.maketrans("", "", "\\")
+
+
+@functools.lru_cache(maxsize=4096)
+def _fetch_pypi_versions(package_name: str) -> tuple[str, ...]:
+    """
+    Retrieves all versions available on PyPI for a package. Results are cached for the
+    lifetime of the process since a package can be referenced by several requirements.
+    """
+    url = f"https://pypi.org/simple/{package_name}/"
+    log.debug(f"Retrieving PyPI package versions from {url}")
+    response = SESSION.get(
+        url,
+        headers={"Accept": PYPI_SIMPLE_INDEX_CONTENT_TYPE},
+        timeout=PYPI_REQUEST_TIMEOUT,
+    )
+    # indexes and mirrors ignoring content negotiation answer with the HTML flavour instead
+    is_json = response.headers.get("Content-Type", "").startswith(PYPI_SIMPLE_INDEX_CONTENT_TYPE)
+    data = response.json() if response.status_code == 200 and is_json else {}
+
+    if "versions" in data:
+        versions = tuple(data["versions"])
+    elif response.status_code in (200, 406):
+        # the index does not serve PEP 691 JSON with PEP 700 version lists, use the JSON API instead
+        url = f"https://pypi.org/pypi/{package_name}/json"
+        log.debug(f"Retrieving PyPI package metadata information from {url}")
+        response = SESSION.get(url, timeout=PYPI_REQUEST_TIMEOUT)
+        if response.status_code != 200:
+            log.debug(f"No version available, status code {response.status_code}")
+            return ()
+        versions = tuple(response.json()["releases"].keys())
+    else:
+        log.debug(f"No version available, status code {response.status_code}")
+        return ()
+
+    log.debug(f"Retrieved versions {', '.join(versions)}")
+    return versions
+
 
 class PypiRequirementsScanner(ProjectScanner):
     """
@@ -37,12 +103,9 @@ class PypiRequirementsScanner(ProjectScanner):
         sanitized_lines = []
 
         for line in requirements:
-            is_requirement = re.match(r"\w", line)
+            is_requirement = REQUIREMENT_LINE_PATTERN.match(line)
             if is_requirement:
-                if "\\" in line:
-                    line = line.replace("\\", "")
-
-                stripped_line = line.strip()
+                stripped_line = line.translate(BACKSLASH_REMOVAL_TABLE).strip()
                 if len(stripped_line) > 0:
                     sanitized_lines.append(stripped_line)
 
@@ -72,39 +135,27 @@ class PypiRequirementsScanner(ProjectScanner):
 
         def get_matched_versions(versions: set[str], semver_range: str) -> set[str]:
             """
-            Retrieves all versions that match a given semver selector
+            Retrieves all versions that match a given PEP 440 specifier set (e.g. ">=1.0,<2.0")
             """
-            result = []
-
             # Filters to specified versions
             try:
-                spec = Specifier(semver_range)
-                result = [Version(m) for m in spec.filter(versions)]
+                spec = SpecifierSet(semver_range)
+                result = set(spec.filter(versions))
+
+                # If just the best matched version scan is required we only keep one
+                if not VERIFY_EXHAUSTIVE_DEPENDENCIES and result:
+                    result = {max(result, key=Version)}
             except ValueError:
                 # use it raw
                 return set([semver_range])
 
-            # If just the best matched version scan is required we only keep one
-            if not VERIFY_EXHAUSTIVE_DEPENDENCIES and result:
-                result = [sorted(result).pop()]
-
-            return set([str(r) for r in result])
+            return result
 
         def find_all_versions(package_name: str) -> set[str]:
             """
             This helper function retrieves all versions availables for the package
             """
-            url = "https://pypi.org/pypi/%s/json" % (package_name,)
-            log.debug(f"Retrieving PyPI package metadata information from {url}")
-            response = requests.get(url)
-            if response.status_code != 200:
-                log.debug(f"No version available, status code {response.status_code}")
-                return set()
-
-            data = response.json()
-            versions = set(sorted(data["releases"].keys()))
-            log.debug(f"Retrieved versions {', '.join(versions)}")
-            return versions
+            return set(_fetch_pypi_versions(package_name))
 
         def safe_parse_requirements(req):
             """
@@ -123,11 +174,23 @@ class PypiRequirementsScanner(ProjectScanner):
                     )
                     yield None
 
+        def prefetch_versions(package_names: set[str]) -> None:
+            """
+            This helper function concurrently warms the versions cache of all packages,
+            lookup failures are ignored here and surface again when the versions are used
+            """
+            with ThreadPoolExecutor(max_workers=PARALLELISM) as pool:
+                concurrent.futures.wait(
+                    [pool.submit(_fetch_pypi_versions, name) for name in package_names]
+                )
+
         try:
-            for requirement in safe_parse_requirements(sanitized_requirements):
-                if requirement is None:
-                    continue
+            parsed_requirements = [
+                r for r in safe_parse_requirements(sanitized_requirements) if r is not None
+            ]
+            prefetch_versions(set(r.project_name for r in parsed_requirements))
 
+            for requirement in parsed_requirements:
                 versions = get_matched_versions(
                     find_all_versions(requirement.project_name),
                     (
@@ -99,29 +99,29 @@ class ProjectScanner(Scanner):
             f"Scanning using at most {num_workers} parallel worker threads\n"
         )
         sys.stderr.flush()
+        results = []
         with ThreadPoolExecutor(max_workers=num_workers) as pool:
             try:
-                futures: typing.List[concurrent.futures.Future] = []
+                futures: typing.Dict[concurrent.futures.Future, tuple] = {}
                 for dependency, versions in dependencies.items():
                     assert versions is None or len(versions) > 0
-                    if versions is None:
-                        # this will cause scan_remote to use the latest version
-                        futures.append(
-                            pool.submit(scan_single_dependency, dependency, None)
-                        )
-                    else:
-                        futures.extend(
-                            map(
-                                lambda version: pool.submit(
-                                    scan_single_dependency, dependency, version
-                                ),
-                                versions,
-                            )
-                        )
-
-                results = []
+                    # a None version will cause scan_remote to use the latest version
+                    for version in versions if versions is not None else [None]:
+                        future = pool.submit(scan_single_dependency, dependency, version)
+                        futures[future] = (dependency, version)
+
                 for future in concurrent.futures.as_completed(futures):
-                    result = future.result()
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        # a single failing dependency must not abort the whole scan
+                        dependency, version = futures[future]
+                        log.error(f"Failed to scan {dependency} version {version}: {str(e)}")
+                        result = {
+                            "dependency": dependency,
+                            "version": version,
+                            "result": {"issues": 0, "errors": {"scan": str(e)}},
+                        }
                     if callback is not None:
                         callback(result)
                     results.append(result)
@@ -9,6 +9,16 @@ PARALLELISM: int = int(
     os.environ.get("GUARDDOG_PARALLELISM", multiprocessing.cpu_count())
 )
 
+"""
+This parameter overrides the amount of jobs (--jobs) each semgrep invocation may use
+- Default: Number of CPUs available, which is also semgrep's own default
+Project scans (verify) run up to GUARDDOG_PARALLELISM semgrep processes at once,
+lower either value to reduce the total amount of jobs on constrained CI runners
+"""
+SEMGREP_JOBS: int = int(
+    os.environ.get("GUARDDOG_JOBS", multiprocessing.cpu_count())
+)
+
 """
 This flag specifies if an analysis of all posible versions is required
 - True: All possible versions are analyzed
@@ -18,6 +28,16 @@ VERIFY_EXHAUSTIVE_DEPENDENCIES: bool = (
     os.environ.get("GUARDDOG_VERIFY_EXHAUSTIVE_DEPENDENCIES", "false").lower() == "true"
 )
 
+"""
+This flag specifies if metadata rule results are cached for the lifetime of the process,
+keyed by rule, package name and version
+- True: A package version scanned several times is only evaluated once per rule
+- False [default]: Metadata rules are evaluated on every scan
+"""
+METADATA_CACHE: bool = (
+    os.environ.get("GUARDDOG_META_CACHE", "false").lower() in ("true", "1")
+)
+
 """
 This parameter specifies the location of the top packages cache
 - Default: guarddog/analyzer/metadata/resources
@@ -16,8 +16,9 @@ class TestEmptyInformation:
     npm_detector = NPMEmptyInfoDetector()
     nonempty_information = PYPI_PACKAGE_INFO
     empty_information = generate_pypi_project_info("description", "")
+    null_information = generate_pypi_project_info("description", None)
 
-    @pytest.mark.parametrize("package_info", [empty_information])
+    @pytest.mark.parametrize("package_info", [empty_information, null_information])
     def test_empty(self, package_info):
         matches, _ = self.pypi_detector.detect(package_info)
         assert matches
@@ -0,0 +1,17 @@
+from guarddog import ecosystems
+from guarddog.analyzer.analyzer import Analyzer
+
+
+def test_metadata_analyzer_caches_results(mocker):
+    mocker.patch("guarddog.analyzer.analyzer.METADATA_CACHE", True)
+    analyzer = Analyzer(ecosystem=ecosystems.ECOSYSTEM.PYPI)
+    detect = mocker.patch.object(
+        analyzer.metadata_detectors["empty_information"], "detect", return_value=(True, "empty")
+    )
+
+    for _ in range(2):
+        result = analyzer.analyze_metadata("/tmp", {}, {"empty_information"}, "foo", "1.0.0")
+        assert result["results"] == {"empty_information": "empty"}
+        assert result["issues"] == 1
+
+    detect.assert_called_once()
@@ -0,0 +1,63 @@
+import pytest
+
+import guarddog.cli
+from guarddog.ecosystems import ECOSYSTEM
+from guarddog.scanners.scanner import ProjectScanner
+
+
+class StubPackageScanner:
+    def scan_remote(self, name, version=None, rules=None):
+        if name == "broken":
+            raise Exception("download failed")
+        return {"issues": 0, "errors": {}, "results": {}}
+
+
+class StubRequirementsScanner(ProjectScanner):
+    def __init__(self, dependencies=None) -> None:
+        super().__init__(StubPackageScanner())
+        self.dependencies = dependencies or {"healthy": {"1.0.0"}, "broken": {"2.0.0"}}
+
+    def parse_requirements(self, raw_requirements: str) -> dict[str, set[str]]:
+        return self.dependencies
+
+
+def test_scan_requirements_isolates_failing_dependency():
+    scanner = StubRequirementsScanner()
+    callback_results = []
+
+    results = scanner.scan_requirements("", callback=callback_results.append)
+
+    assert len(results) == 2
+    assert callback_results == results
+
+    by_dependency = {r["dependency"]: r for r in results}
+    assert by_dependency["healthy"]["version"] == "1.0.0"
+    assert by_dependency["healthy"]["result"] == {"issues": 0, "errors": {}, "results": {}}
+    assert by_dependency["broken"]["version"] == "2.0.0"
+    assert by_dependency["broken"]["result"] == {"issues": 0, "errors": {"scan": "download failed"}}
+
+
+@pytest.mark.parametrize("exit_non_zero_on_finding", [False, True])
+def test_verify_exits_with_error_when_a_dependency_fails_to_scan(mocker, tmp_path, capsys, exit_non_zero_on_finding):
+    requirements = tmp_path / "requirements.txt"
+    requirements.write_text("healthy==1.0.0\nbroken==2.0.0\n")
+    mocker.patch("guarddog.cli.get_scanner", return_value=StubRequirementsScanner())
+
+    with pytest.raises(SystemExit) as e:
+        guarddog.cli._verify(str(requirements), (), (), None, exit_non_zero_on_finding, ECOSYSTEM.PYPI)
+
+    assert e.value.code == guarddog.cli.EXIT_CODE_SCAN_FAILED
+    output = capsys.readouterr().out
+    assert "0 potentially malicious indicators scanning healthy version 1.0.0" in output
+    assert "indicators scanning broken" not in output
+    assert "Some rules failed to run while scanning broken version 2.0.0" in output
+
+
+def test_verify_succeeds_when_all_dependencies_are_scanned(mocker, tmp_path):
+    requirements = tmp_path / "requirements.txt"
+    requirements.write_text("healthy==1.0.0\n")
+    mocker.patch(
+        "guarddog.cli.get_scanner", return_value=StubRequirementsScanner({"healthy": {"1.0.0"}})
+    )
+
+    guarddog.cli._verify(str(requirements), (), (), None, True, ECOSYSTEM.PYPI)
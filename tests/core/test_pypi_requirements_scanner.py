@@ -1,4 +1,26 @@
-from guarddog.scanners.pypi_project_scanner import PypiRequirementsScanner
+import pytest
+
+from guarddog.scanners import pypi_project_scanner
+from guarddog.scanners.pypi_project_scanner import PypiRequirementsScanner, _fetch_pypi_versions
+
+
+@pytest.fixture(autouse=True)
+def clear_versions_cache():
+    _fetch_pypi_versions.cache_clear()
+    yield
+    _fetch_pypi_versions.cache_clear()
+
+
+def mock_response(mocker, status_code, payload=None, content_type="application/json"):
+    return mocker.Mock(
+        status_code=status_code,
+        headers={"Content-Type": content_type},
+        json=mocker.Mock(return_value=payload),
+    )
+
+
+def mock_simple_index_response(mocker, status_code, payload=None):
+    return mock_response(mocker, status_code, payload, pypi_project_scanner.PYPI_SIMPLE_INDEX_CONTENT_TYPE)
 
 
 # Regression test for https://github.com/DataDog/guarddog/issues/78
@@ -28,3 +50,64 @@ def test_requirements_scanner_on_git_url_packages():
     assert "git+https://github.com/DataDog/guarddog.git" in result["guarddog"]
     assert "flask" in result
     assert len(result) == 2
+
+
+def test_requirements_scanner_on_version_ranges():
+    scanner = PypiRequirementsScanner()
+    result = scanner.parse_requirements("flask>=2.0,<2.1")
+    assert result["flask"] == {"2.0.3"}
+
+
+def test_fetch_versions_from_simple_index(mocker):
+    get = mocker.patch.object(
+        pypi_project_scanner.SESSION,
+        "get",
+        return_value=mock_simple_index_response(mocker, 200, {"name": "foo", "versions": ["1.0", "1.1"]}),
+    )
+    assert set(_fetch_pypi_versions("foo")) == {"1.0", "1.1"}
+    get.assert_called_once()
+    assert get.call_args.args[0] == "https://pypi.org/simple/foo/"
+    assert get.call_args.kwargs["headers"]["Accept"] == pypi_project_scanner.PYPI_SIMPLE_INDEX_CONTENT_TYPE
+
+
+@pytest.mark.parametrize(
+    "status_code, payload, content_type",
+    [
+        # index without PEP 700 versions
+        (200, {"name": "foo", "files": []}, pypi_project_scanner.PYPI_SIMPLE_INDEX_CONTENT_TYPE),
+        # index ignoring content negotiation
+        (200, None, "text/html"),
+        # index refusing the JSON content type
+        (406, None, "text/html"),
+    ],
+)
+def test_fetch_versions_falls_back_to_json_api(mocker, status_code, payload, content_type):
+    get = mocker.patch.object(
+        pypi_project_scanner.SESSION,
+        "get",
+        side_effect=[
+            mock_response(mocker, status_code, payload, content_type),
+            mock_response(mocker, 200, {"releases": {"1.0": [], "2.0": []}}),
+        ],
+    )
+    assert set(_fetch_pypi_versions("foo")) == {"1.0", "2.0"}
+    assert get.call_count == 2
+    assert get.call_args.args[0] == "https://pypi.org/pypi/foo/json"
+
+
+def test_fetch_versions_fallback_failure(mocker):
+    mocker.patch.object(
+        pypi_project_scanner.SESSION,
+        "get",
+        side_effect=[mock_response(mocker, 406), mock_response(mocker, 404)],
+    )
+    assert _fetch_pypi_versions("foo") == ()
+
+
+@pytest.mark.parametrize("status_code", [404, 500])
+def test_fetch_versions_not_found(mocker, status_code):
+    get = mocker.patch.object(
+        pypi_project_scanner.SESSION, "get", return_value=mock_response(mocker, status_code)
+    )
+    assert _fetch_pypi_versions("foo") == ()
+    get.assert_called_once()